@@ -1,12 +1,106 @@
 from preswald import text, plotly, table
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as pads
 import plotly.express as px
+import contextlib
 import glob
+import hashlib
 import os
+import tempfile
 
 text("# Kimai Dashboard")
 text("This dashboard loads all your Kimai CSV exports from ../csv/ and shows a summary, table, and chart.")
 
+# Column types for the exported CSVs. Timestamps are kept as strings here because
+# Kimai writes them with a UTC offset, which Arrow would normalise to UTC.
+CSV_COLUMN_TYPES = {
+    'begin': pa.string(),
+    'end': pa.string(),
+    'customer': pa.string(),
+    'project': pa.string(),
+    'activity': pa.string(),
+    'description': pa.string(),
+    'duration': pa.float64(),
+}
+
+# Trailing UTC offset of a Kimai timestamp, e.g. the '+0200' in 2025-04-01T09:00:00+0200
+UTC_OFFSET = r'(?:Z|[+-]\d{2}:?\d{2})$'
+
+# Parquet cache of the combined CSVs; bump the version when the cached columns or dtypes change
+CACHE_VERSION = 1
+CACHE_DIR = os.path.join(os.getcwd(), '.cache')
+
+
+def load_cached(csv_files):
+    """
+    Load all CSV exports into a single DataFrame with parsed datetimes and duration.
+    Reuses the cached Parquet copy while none of the CSVs have changed.
+    """
+    stats = sorted((f, os.path.getmtime(f), os.path.getsize(f)) for f in csv_files)
+    key = hashlib.md5(repr((CACHE_VERSION, stats)).encode()).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f'combined-{key}.parquet')
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path)
+
+    # Read all CSVs in a single multithreaded Arrow scan
+    # Exports from older CLI versions have no duration column; the dataset schema fills it with nulls
+    csv_format = pads.CsvFileFormat(convert_options=pacsv.ConvertOptions(column_types=CSV_COLUMN_TYPES))
+    ds = pads.dataset(csv_files, format=csv_format, schema=pa.schema(CSV_COLUMN_TYPES))
+    df = ds.to_table(use_threads=True).to_pandas(self_destruct=True)
+
+    # Parse datetime columns as wall-clock time; duration (in hours) comes from the export itself.
+    # The UTC offset is stripped first, so exports spanning a DST change (+0100 and +0200)
+    # still give one datetime64 column. ISO 8601 skips format inference, and cache reuses repeats.
+    for c in ('begin', 'end'):
+        wall_clock = df[c].str.replace(UTC_OFFSET, '', regex=True)
+        df[c] = pd.to_datetime(wall_clock, format='ISO8601', cache=True)
+
+    # Only rows from older exports without a duration are derived from begin/end
+    missing = df['duration'].isna()
+    if missing.any():
+        df.loc[missing, 'duration'] = (df.loc[missing, 'end'] - df.loc[missing, 'begin']).dt.total_seconds() / 3600
+
+    # Low-cardinality text as category and hours as float32 keep the frame small for the groupbys
+    for c in ('customer', 'project', 'activity'):
+        df[c] = df[c].astype('category')
+    df['duration'] = df['duration'].astype('float32')
+
+    # Parquet would silently coerce timestamps that did not parse to datetime64, so skip caching them
+    if not all(pd.api.types.is_datetime64_dtype(df[c]) for c in ('begin', 'end')):
+        return df
+
+    # Write under a unique temp name so concurrent sessions never clobber each other
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # Only once the new cache is in place, drop the ones for older sets of CSVs
+    for stale in glob.glob(os.path.join(CACHE_DIR, 'combined-*.parquet')):
+        if stale != cache_path:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(stale)
+    return df
+
+
+def format_minutes(s):
+    """
+    Format a wall-clock datetime column as 'YYYY-MM-DD HH:MM'.
+    Uses numpy's vectorised formatter instead of strftime on every value.
+    """
+    formatted = np.datetime_as_string(s.to_numpy(dtype='datetime64[m]'), unit='m')
+    # Missing values (e.g. the end of a running timer) stay missing, as with strftime
+    return pd.Series(formatted, index=s.index).str.replace('T', ' ', regex=False).where(s.notna())
+
+
 # --- Load and combine all CSVs from the ../csv/ folder ---
 csv_folder = os.path.abspath(os.path.join(os.getcwd(), '..', 'csv'))
 csv_files = glob.glob(os.path.join(csv_folder, '*.csv'))
@@ -14,42 +108,42 @@ csv_files = glob.glob(os.path.join(csv_folder, '*.csv'))
 if not csv_files:
     text('No CSV files found in ../csv/. Please export some reports first.')
 else:
-    # Concatenate all CSVs into a single DataFrame
-    df = pd.concat([pd.read_csv(f) for f in csv_files], ignore_index=True)
-
-    # Parse datetime columns and calculate duration (in hours) if not present
-    df['begin'] = pd.to_datetime(df['begin'])
-    df['end'] = pd.to_datetime(df['end'])
-    if 'duration' not in df.columns:
-        df['duration'] = (df['end'] - df['begin']).dt.total_seconds() / 3600
+    df = load_cached(csv_files)
 
     # Show summary
     total_hours = df['duration'].sum()
     text(f"**Total hours:** {total_hours:.2f}")
 
-    # Convert datetime columns to string for display in the table
-    display_df = df.copy()
-    display_df['begin'] = display_df['begin'].dt.strftime('%Y-%m-%d %H:%M')
-    display_df['end'] = display_df['end'].dt.strftime('%Y-%m-%d %H:%M')
-    table(display_df[['begin', 'end', 'customer', 'project', 'activity', 'description', 'duration']])
+    # Convert datetime columns to string for display in the table. The other columns are
+    # passed through with copy=False, so only the two formatted columns are new memory.
+    display_df = pd.DataFrame({
+        'begin': format_minutes(df['begin']),
+        'end': format_minutes(df['end']),
+        'customer': df['customer'],
+        'project': df['project'],
+        'activity': df['activity'],
+        'description': df['description'],
+        'duration': df['duration'],
+    }, copy=False)
+    table(display_df)
 
-    # Plot: Hours per day
-    hours_per_day = df.groupby(df['begin'].dt.date)['duration'].sum().reset_index()
+    # Plot: Hours per day (floor('D') stays datetime64 instead of building Python date objects)
+    hours_per_day = df.groupby(df['begin'].dt.floor('D'), sort=True)['duration'].sum().reset_index()
     fig = px.line(hours_per_day, x='begin', y='duration', markers=True,
                   title='Hours per Day', labels={'begin': 'Date', 'duration': 'Total Hours'})
     plotly(fig)
 
     # --- Plot: Activity % per month ---
-    # Add year-month column
-    df['year_month'] = df['begin'].dt.to_period('M').astype(str)
-    months = df['year_month'].unique()
-    for ym in months:
-        month_df = df[df['year_month'] == ym]
-        activity_summary = month_df.groupby('activity')['duration'].sum().reset_index()
-        total = activity_summary['duration'].sum()
-        activity_summary['percent'] = 100 * activity_summary['duration'] / total if total > 0 else 0
-        pie = px.pie(activity_summary, names='activity', values='percent',
-                     title=f'Activity % Breakdown for {ym}',
-                     labels={'percent': '% of Hours', 'activity': 'Activity'},
-                     hole=0.4)
-        plotly(pie)
+    # Year-month keys stay int64-backed periods for the groupby;
+    # only the per-month result is turned into labels.
+    year_month = df['begin'].dt.to_period('M').rename('year_month')
+    # Hours per activity for every month in one groupby, as % of each month's total
+    hours = df.groupby([year_month, 'activity'], observed=True, sort=True)['duration'].sum()
+    monthly = (100 * hours / hours.groupby(level='year_month').transform('sum')).rename('percent').reset_index()
+    monthly = monthly[monthly['percent'] > 0].assign(year_month=lambda m: m['year_month'].astype(str))
+
+    # A single stacked bar chart instead of one pie figure per month
+    fig = px.bar(monthly, x='year_month', y='percent', color='activity', barmode='stack',
+                 title='Activity % Breakdown per Month',
+                 labels={'year_month': 'Month', 'percent': '% of Hours', 'activity': 'Activity'})
+    plotly(fig)
@@ -1,7 +1,70 @@
 import preswald as pw
-import pandas as pd
+import polars as pl
+import contextlib
 import glob
+import hashlib
 import os
+import tempfile
+
+# Kimai writes timestamps with a UTC offset (e.g. 2025-04-01T09:00:00+0200).
+# Only the local wall-clock part is parsed, so per-day grouping matches the export.
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+# Parquet cache of the combined CSVs; bump the version when the cached columns or dtypes change
+CACHE_VERSION = 1
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.cache')
+
+
+def load_cached(csv_files):
+    """
+    Return a lazy frame over all CSV exports with parsed datetimes and duration.
+    The frame scans a cached Parquet copy, rebuilt only when a CSV changes.
+    """
+    stats = sorted((f, os.path.getmtime(f), os.path.getsize(f)) for f in csv_files)
+    key = hashlib.md5(repr((CACHE_VERSION, stats)).encode()).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f'combined-{key}.parquet')
+    if os.path.exists(cache_path):
+        return pl.scan_parquet(cache_path)
+
+    # Exports from older CLI versions have no duration column; the diagonal concat fills it with nulls
+    lf = pl.concat([pl.scan_csv(f) for f in csv_files], how='diagonal_relaxed')
+    if 'duration' not in lf.collect_schema().names():
+        lf = lf.with_columns(pl.lit(None, dtype=pl.Float64).alias('duration'))
+    # Non-strict parsing turns empty values (e.g. the end of a running timer) into nulls
+    lf = lf.with_columns(
+        pl.col('begin').str.slice(0, 19).str.to_datetime(TIMESTAMP_FORMAT, strict=False),
+        pl.col('end').str.slice(0, 19).str.to_datetime(TIMESTAMP_FORMAT, strict=False),
+    )
+
+    # Duration (in hours) comes from the export; only older rows are derived from begin/end
+    lf = lf.with_columns(
+        pl.col('duration').fill_null((pl.col('end') - pl.col('begin')).dt.total_seconds() / 3600)
+    )
+
+    # Low-cardinality text as categorical and hours as float32 keep the frame small for the groupbys
+    lf = lf.with_columns(
+        pl.col('customer', 'project', 'activity').cast(pl.Categorical),
+        pl.col('duration').cast(pl.Float32),
+    )
+
+    # Write under a unique temp name so concurrent sessions never clobber each other
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        lf.sink_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # Only once the new cache is in place, drop the ones for older sets of CSVs
+    for stale in glob.glob(os.path.join(CACHE_DIR, 'combined-*.parquet')):
+        if stale != cache_path:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(stale)
+    return pl.scan_parquet(cache_path)
+
 
 # --- Load and combine all CSVs from the ../csv/ folder ---
 csv_folder = os.path.join(os.path.dirname(__file__), '..', 'csv')
@@ -11,35 +74,38 @@ if not csv_files:
     pw.text('No CSV files found in ../csv/. Please export some reports first.')
     pw.stop()
 
-# Concatenate all CSVs into a single DataFrame
-df = pd.concat([pd.read_csv(f) for f in csv_files], ignore_index=True)
-
-# Parse datetime columns and calculate duration (in hours) if not present
-df['begin'] = pd.to_datetime(df['begin'])
-df['end'] = pd.to_datetime(df['end'])
-if 'duration' not in df.columns:
-    df['duration'] = (df['end'] - df['begin']).dt.total_seconds() / 3600
+# Lazily scan all CSVs; nothing is read until a filtered slice is collected
+lf = load_cached(csv_files)
 
 # --- UI: Date range filter ---
-min_date = df['begin'].min().date()
-max_date = df['end'].max().date()
+bounds = lf.select(pl.col('begin').min(), pl.col('end').max()).collect()
+if bounds['begin'][0] is None or bounds['end'][0] is None:
+    pw.text('The CSV files in ../csv/ contain no timesheet entries. Please export a month with entries first.')
+    pw.stop()
+min_date = bounds['begin'][0].date()
+max_date = bounds['end'][0].date()
 date_range = pw.date_range_input('Select date range', min_value=min_date, max_value=max_date, value=(min_date, max_date))
-filtered = df[(df['begin'].dt.date >= date_range[0]) & (df['end'].dt.date <= date_range[1])]
+lf = lf.filter((pl.col('begin').dt.date() >= date_range[0]) & (pl.col('end').dt.date() <= date_range[1]))
 
 # --- UI: Project filter ---
-projects = ['All'] + sorted(filtered['project'].dropna().unique().tolist())
+projects = ['All'] + sorted(lf.select(pl.col('project').drop_nulls().unique()).collect()['project'].to_list())
 project = pw.selectbox('Project', options=projects)
 if project != 'All':
-    filtered = filtered[filtered['project'] == project]
+    lf = lf.filter(pl.col('project') == project)
+
+# Only the filtered slice is materialised into pandas
+filtered = lf.collect(engine='streaming').to_pandas()
 
 # --- Show summary ---
 pw.text(f"Total hours: {filtered['duration'].sum():.2f}")
 pw.table(filtered[['begin', 'end', 'customer', 'project', 'activity', 'description', 'duration']])
 
 # --- Plot: Hours per day ---
-hours_per_day = filtered.groupby(filtered['begin'].dt.date)['duration'].sum()
+# floor('D') stays datetime64 instead of building Python date objects; dates are formatted once for the axis
+hours_per_day = filtered.groupby(filtered['begin'].dt.floor('D'), sort=True)['duration'].sum()
+hours_per_day.index = hours_per_day.index.strftime('%Y-%m-%d')
 pw.line_chart(hours_per_day, title='Hours per Day')
 
 # --- Plot: Hours by activity ---
-hours_by_activity = filtered.groupby('activity')['duration'].sum()
+hours_by_activity = filtered.groupby('activity', observed=True)['duration'].sum()
 pw.bar_chart(hours_by_activity, title='Hours by Activity') 
\ No newline at end of file
@@ -22,10 +22,13 @@
 # ————————————————————————————————————————————————
 
 import requests
-import csv
+import ijson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import typer
-from typing import Optional, List, Tuple, Dict, Any
+import xlsxwriter
+from typing import Optional, Iterable, Iterator, Tuple, Dict, Any
 from datetime import datetime
 from calendar import monthrange
 import os
@@ -52,6 +55,25 @@ MONTHS = [
     ("December",  "Diciembre"),
 ]
 
+# Month number -> (English, Spanish) names, and the prebuilt selection menu
+MONTH_LOOKUP = {i: names for i, names in enumerate(MONTHS, 1)}
+MONTH_MENU = "\n".join(f"  {i}. {en} / {es}" for i, (en, es) in MONTH_LOOKUP.items())
+
+# Flattened Kimai entry fields exported to CSV/Excel, mapped to their column names
+EXPORT_COLUMNS = {
+    "begin":                 "begin",
+    "end":                   "end",
+    "project.customer.name": "customer",
+    "project.name":          "project",
+    "activity.name":         "activity",
+    "description":           "description",
+}
+
+# Arrow schema of the exported table (text columns plus duration in hours)
+EXPORT_SCHEMA = pa.schema(
+    [(name, pa.string()) for name in EXPORT_COLUMNS.values()] + [("duration", pa.float64())]
+)
+
 def get_month_range(year: int, month: int) -> Tuple[str, str]:
     """
     Return the ISO 8601 datetime strings for the beginning and end of a given month/year.
@@ -68,10 +90,11 @@ def fetch_timesheets(
     user_id: int,
     date_begin: str,
     date_end: str
-) -> List[Dict[str, Any]]:
+) -> Iterator[Dict[str, Any]]:
     """
     Fetch timesheet entries from the Kimai API for a given user and date range.
-    Returns a list of entry dictionaries.
+    Yields entry dictionaries as they are parsed from the streamed response body,
+    so the full JSON payload is never held in memory.
     Raises an exception if the request fails.
     """
     headers = {
@@ -84,56 +107,59 @@ def fetch_timesheets(
         "end": date_end,
         "full": 1
     }
-    resp = requests.get(api_url, headers=headers, params=params)
-    resp.raise_for_status()
-    return resp.json()
-
-def process_entries(entries: List[Dict[str, Any]]) -> Tuple[List[List[str]], float]:
+    with requests.get(api_url, headers=headers, params=params, stream=True) as resp:
+        resp.raise_for_status()
+        # Let urllib3 undo any gzip/deflate encoding before ijson reads the raw stream
+        resp.raw.decode_content = True
+        # use_float decodes non-integer numbers as float rather than the slower Decimal
+        yield from ijson.items(resp.raw, "item", use_float=True)
+
+def process_entries(entries: Iterable[Dict[str, Any]]) -> Tuple[pd.DataFrame, float]:
     """
-    Process Kimai timesheet entries into rows for export and sum total duration in hours.
-    Returns a tuple: (rows, total_hours)
-    - rows: List of lists, each representing a row for CSV/Excel
+    Process Kimai timesheet entries into a table for export and sum total duration in hours.
+    Returns a tuple: (df, total_hours)
+    - df: DataFrame with one row per entry, ready for CSV/Excel
     - total_hours: Total duration in hours (float)
     """
-    rows: List[List[str]] = []
-    total_seconds: int = 0
-    for e in entries:
-        begin    = e.get("begin", "")
-        end      = e.get("end", "")
-        customer = e.get("project", {}).get("customer", {}).get("name", "")
-        project  = e.get("project", {}).get("name", "")
-        activity = e.get("activity", {}).get("name", "")
-        desc     = (e.get("description") or "").replace("\r\n", " ").replace("\n", " ")
-        duration = e.get("duration", 0)
-        total_seconds += duration
-        rows.append([begin, end, customer, project, activity, desc])
-    total_hours = total_seconds / 3600
-    return rows, total_hours
-
-def write_csv(filename: str, rows: List[List[str]]) -> None:
+    # Flatten the nested project/customer/activity dicts in one pass
+    flat = pd.json_normalize(list(entries)).reindex(columns=[*EXPORT_COLUMNS, "duration"])
+    # astype(str) keeps the columns text even when the month has no entries
+    df = flat[list(EXPORT_COLUMNS)].rename(columns=EXPORT_COLUMNS).fillna("").astype(str)
+    df["description"] = df["description"].str.replace(r"\r?\n", " ", regex=True)
+    # Kimai reports seconds; export hours so the dashboards can use the column as-is
+    df["duration"] = flat["duration"].fillna(0) / 3600
+    total_hours = float(df["duration"].sum())
+    return df, total_hours
+
+def write_csv(filename: str, df: pd.DataFrame) -> None:
     """
-    Write the provided rows to a CSV file with a header row.
+    Write the provided entries to a CSV file with a header row.
     """
     # Ensure the csv/ directory exists
     os.makedirs(os.path.dirname(filename), exist_ok=True)
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["begin","end","customer","project","activity","description"])
-        writer.writerows(rows)
+    # Arrow serialises the columns in C instead of formatting every field in Python
+    table = pa.Table.from_pandas(df, schema=EXPORT_SCHEMA, preserve_index=False)
+    pacsv.write_csv(table, filename, write_options=pacsv.WriteOptions(include_header=True))
 
-def write_excel(filename: str, rows: List[List[str]], total_hours: float) -> None:
+def write_excel(filename: str, df: pd.DataFrame, total_hours: float) -> None:
     """
-    Write the provided rows to an Excel file with two sheets:
+    Write the provided entries to an Excel file with two sheets:
     - 'Data': All timesheet entries
     - 'Summary': Total hours worked
     """
     # Ensure the excel/ directory exists
     os.makedirs(os.path.dirname(filename), exist_ok=True)
-    with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-        df = pd.DataFrame(rows, columns=["begin","end","customer","project","activity","description"])
-        df.to_excel(writer, sheet_name="Data", index=False)
-        summary_df = pd.DataFrame([{"Total hours": total_hours}])
-        summary_df.to_excel(writer, sheet_name="Summary", index=False)
+    # constant_memory streams each row to disk instead of keeping every cell in memory.
+    # It drops cells written to earlier rows, so the sheet is filled row by row rather
+    # than with df.to_excel, which writes column by column.
+    with xlsxwriter.Workbook(filename, {"constant_memory": True}) as book:
+        data = book.add_worksheet("Data")
+        data.write_row(0, 0, df.columns)
+        for row_idx, row in enumerate(df.itertuples(index=False, name=None), 1):
+            data.write_row(row_idx, 0, row)
+        summary = book.add_worksheet("Summary")
+        summary.write_string(0, 0, "Total hours")
+        summary.write_number(1, 0, total_hours)
 
 # ——— Typer CLI Command ———
 @app.command()
@@ -159,14 +185,12 @@ def export(
     """
     # Print month selection menu if month is not provided
     if month is None:
-        typer.echo("Select the month:")
-        for idx, (en, es) in enumerate(MONTHS, 1):
-            typer.echo(f"  {idx}. {en} / {es}")
+        typer.echo(f"Select the month:\n{MONTH_MENU}")
         while True:
             try:
                 month_input = typer.prompt("Enter the number of the month (1-12)")
                 month = int(month_input)
-                if 1 <= month <= 12:
+                if month in MONTH_LOOKUP:
                     break
                 else:
                     typer.echo("Please enter a number between 1 and 12.")
@@ -193,22 +217,23 @@ def export(
     csv_dir = "csv"
     excel_dir = "excel"
     if not output_csv:
-        output_csv = os.path.join(csv_dir, f"monthly-report-{year}-{int(month):02d}.csv")
+        output_csv = os.path.join(csv_dir, f"monthly-report-{year}-{month:02d}.csv")
     if not output_xlsx:
-        output_xlsx = os.path.join(excel_dir, f"monthly-report-{year}-{int(month):02d}.xlsx")
+        output_xlsx = os.path.join(excel_dir, f"monthly-report-{year}-{month:02d}.xlsx")
 
     # Calculate date range for the selected month/year
-    date_begin, date_end = get_month_range(year, int(month))
+    date_begin, date_end = get_month_range(year, month)
 
-    typer.echo(f"Fetching timesheets for user {user_id}, {year}-{int(month):02d} ({MONTHS[int(month)-1][0]} / {MONTHS[int(month)-1][1]})...")
+    en, es = MONTH_LOOKUP[month]
+    typer.echo(f"Fetching timesheets for user {user_id}, {year}-{month:02d} ({en} / {es})...")
     entries = fetch_timesheets(api_url, api_token, user_id, date_begin, date_end)
-    rows, total_hours = process_entries(entries)
+    df, total_hours = process_entries(entries)
 
-    write_csv(output_csv, rows)
+    write_csv(output_csv, df)
     typer.echo(f"→ CSV saved to {output_csv}")
     typer.echo(f"→ Total time: {total_hours:.2f} hours")
 
-    write_excel(output_xlsx, rows, total_hours)
+    write_excel(output_xlsx, df, total_hours)
     typer.echo(f"→ Excel saved to {output_xlsx} (with 'Data' and 'Summary' sheets)")
 
 if __name__ == "__main__":
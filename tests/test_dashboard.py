@@ -0,0 +1,67 @@
+import os
+import runpy
+import sys
+import types
+
+import pytest
+
+HELLO = os.path.join(os.path.dirname(__file__), "..", "dashboard", "hello.py")
+
+
+def fake_preswald(tables):
+    """Return a stand-in preswald module that records the tables hello.py renders."""
+    module = types.ModuleType("preswald")
+    module.text = lambda *args, **kwargs: None
+    module.plotly = lambda fig, **kwargs: fig.to_json()
+    module.table = lambda df, **kwargs: tables.append(df)
+    return module
+
+
+def test_hello_mixed_utc_offsets_round_trip_through_cache(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("plotly")
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    (csv_dir / "monthly-report-2025-03.csv").write_text(
+        "begin,end,customer,project,activity,description,duration\n"
+        "2025-03-28T09:00:00+0100,2025-03-28T10:00:00+0100,ACME,Website,Development,winter,1\n"
+        "2025-04-01T09:00:00+0200,2025-04-01T10:30:00+0200,ACME,Website,Meeting,summer,1.5\n"
+    )
+    dashboard_dir = tmp_path / "dashboard"
+    dashboard_dir.mkdir()
+    monkeypatch.chdir(dashboard_dir)
+    tables = []
+    monkeypatch.setitem(sys.modules, "preswald", fake_preswald(tables))
+
+    runpy.run_path(HELLO)  # builds the Parquet cache
+    assert len(os.listdir(dashboard_dir / ".cache")) == 1
+    runpy.run_path(HELLO)  # loads from the cache
+
+    for df in tables:
+        assert df["begin"].tolist() == ["2025-03-28 09:00", "2025-04-01 09:00"]
+        assert df["end"].tolist() == ["2025-03-28 10:00", "2025-04-01 10:30"]
+    assert len(tables) == 2
+
+
+def test_hello_table_shares_columns_with_loaded_frame(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("plotly")
+    import numpy as np
+
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    (csv_dir / "monthly-report-2025-04.csv").write_text(
+        "begin,end,customer,project,activity,description,duration\n"
+        "2025-04-01T09:00:00+0200,2025-04-01T10:30:00+0200,ACME,Website,Meeting,summer,1.5\n"
+    )
+    dashboard_dir = tmp_path / "dashboard"
+    dashboard_dir.mkdir()
+    monkeypatch.chdir(dashboard_dir)
+    tables = []
+    monkeypatch.setitem(sys.modules, "preswald", fake_preswald(tables))
+
+    script = runpy.run_path(HELLO)
+
+    df, (display_df,) = script["df"], tables
+    assert np.shares_memory(display_df["duration"].to_numpy(), df["duration"].to_numpy())
+    assert np.shares_memory(display_df["description"].to_numpy(), df["description"].to_numpy())
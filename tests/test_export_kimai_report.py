@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from export_kimai_report import process_entries, write_excel
+
+ENTRIES = [
+    {
+        "begin": "2025-04-01T09:00:00+0200",
+        "end": "2025-04-01T11:30:00+0200",
+        "duration": 9000,
+        "description": "first\nline",
+        "project": {"name": "Website", "customer": {"name": "ACME"}},
+        "activity": {"name": "Development"},
+    },
+    {
+        "begin": "2025-04-02T09:00:00+0200",
+        "end": "2025-04-02T10:00:00+0200",
+        "duration": 3600,
+        "description": None,
+        "project": {"name": "Website", "customer": {"name": "ACME"}},
+        "activity": {"name": "Meeting"},
+    },
+    {
+        "begin": "2025-04-03T14:00:00+0200",
+        "end": "2025-04-03T14:30:00+0200",
+        "duration": 1800,
+        "description": "review",
+        "project": {"name": "App", "customer": {"name": "Globex"}},
+        "activity": {"name": "Development"},
+    },
+]
+
+
+def test_write_excel_round_trip(tmp_path):
+    pytest.importorskip("openpyxl")
+    df, total_hours = process_entries(ENTRIES)
+    filename = str(tmp_path / "excel" / "report.xlsx")
+
+    write_excel(filename, df, total_hours)
+
+    sheets = pd.read_excel(filename, sheet_name=None, keep_default_na=False)
+    pd.testing.assert_frame_equal(sheets["Data"], df, check_dtype=False)
+    assert sheets["Summary"]["Total hours"].tolist() == [pytest.approx(4.0)]